@@ -0,0 +1,252 @@
+# src/disponibilidade.py
+from __future__ import annotations
+
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+from zoneinfo import ZoneInfo
+
+TZ_BR = ZoneInfo("America/Sao_Paulo")
+
+URL_BASE = "https://diariolegislativo.almg.gov.br"
+CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "disponibilidade_cache.json"
+
+# Datas com menos de DIAS_RECENTES de idade ainda podem ganhar DL (publicação
+# tardia, edição extra); a ausência delas expira em TTL_AUSENTE_RECENTE.
+# Ausências antigas e presenças confirmadas não expiram.
+DIAS_RECENTES = 7
+TTL_AUSENTE_RECENTE = 6 * 3600
+
+DataIn = Union[str, date]
+
+
+def _to_date(d: DataIn) -> date:
+    """
+    Aceita apenas date/datetime, "YYYY-MM-DD" (ISO) ou "YYYYMMDD".
+
+    Não interpreta os formatos livres do notebook (ex.: DDMMYYYY, "hoje");
+    normalize antes com `normalizar_data`.
+    """
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    s = str(d).strip()
+    fmt = "%Y-%m-%d" if "-" in s else "%Y%m%d"
+    try:
+        return datetime.strptime(s, fmt).date()
+    except ValueError:
+        raise ValueError(f"Data inválida: {s!r}. Use YYYY-MM-DD ou YYYYMMDD.") from None
+
+
+def montar_url_diario(data: DataIn, *, url_base: str = URL_BASE) -> str:
+    """
+    Fonte única do formato da URL. MATE.ipynb tem uma cópia (URL_BASE e
+    montar_url_diario) que deve ser mantida em sincronia com esta.
+    """
+    d = _to_date(data)
+    return f"{url_base.rstrip('/')}/{d:%Y}/L{d:%Y%m%d}.pdf"
+
+
+def sondar_url(url: str, *, timeout: float = 10.0) -> Optional[bool]:
+    """
+    Verifica se a URL serve um PDF lendo apenas os 5 primeiros bytes (GET com Range).
+
+    Retorna True (é PDF), False (404/410/416 ou corpo completo que não começa com
+    %PDF-) ou None quando não foi possível concluir (timeout, erro de rede/protocolo,
+    5xx, corpo truncado, URL malformada) — nesse caso nada é cacheado.
+    """
+    try:
+        req = urllib.request.Request(url, headers={"Range": "bytes=0-4"})
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            head = r.read(5)
+            # bytes declarados (Content-Length da resposta, inclusive 206) e não recebidos
+            faltando = r.length or 0
+    except urllib.error.HTTPError as e:
+        if e.code in (404, 410):
+            return False
+        # 416: servidor não tem nem 5 bytes -> não é PDF
+        if e.code == 416:
+            return False
+        return None
+    except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError):
+        return None
+    if len(head) < 5 and faltando > 0:
+        # corpo truncado é falha transitória, não ausência confirmada
+        return None
+    # corpo curto e completo (ex.: soft-404 vazio) é ausência confirmada
+    return head == b"%PDF-"
+
+
+def _numero(v) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _entrada_valida(e) -> bool:
+    return (
+        isinstance(e, dict)
+        and isinstance(e.get("existe"), bool)
+        and _numero(e.get("verificado_em", 0))
+        and (e.get("expira_em") is None or _numero(e.get("expira_em")))
+    )
+
+
+class CacheDisponibilidade:
+    """
+    Cache persistente (JSON) de edições com DL confirmado presente/ausente.
+
+    Chaveado pela URL da edição, para que servidores distintos (ex.: um servidor
+    HTTP local) não se misturem.
+    Formato: {"<url>": {"existe": bool, "verificado_em": epoch, "expira_em": epoch|null}}
+    """
+
+    def __init__(self, path: Union[str, os.PathLike, None] = CACHE_PATH):
+        self.path = Path(path) if path is not None else None
+        self._entradas: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._carregar()
+
+    def _ler_disco(self) -> Dict[str, dict]:
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            # cache corrompido não deve derrubar a execução; será regravado
+            return {}
+        if not isinstance(dados, dict):
+            return {}
+        return {k: e for k, e in dados.items() if _entrada_valida(e)}
+
+    def _carregar(self) -> None:
+        self._entradas = self._ler_disco()
+
+    def salvar(self) -> None:
+        """
+        Grava de forma atômica, mesclando com o conteúdo atual do disco
+        (vence a verificação mais recente), para não perder entradas de
+        execuções concorrentes.
+        """
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            mescladas = self._ler_disco()
+            for k, e in self._entradas.items():
+                atual = mescladas.get(k)
+                if atual is None or e.get("verificado_em", 0) >= atual.get("verificado_em", 0):
+                    mescladas[k] = e
+            self._entradas = mescladas
+
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path.parent, suffix=".tmp", delete=False
+            ) as f:
+                json.dump(mescladas, f, ensure_ascii=False, indent=2, sort_keys=True)
+                tmp = f.name
+            try:
+                os.replace(tmp, self.path)
+            except OSError:
+                os.unlink(tmp)
+                raise
+
+    def consultar(
+        self, data: DataIn, *, url_base: str = URL_BASE, agora: Optional[float] = None
+    ) -> Optional[bool]:
+        """
+        True/False se houver entrada válida; None se ausente ou expirada.
+        """
+        agora = time.time() if agora is None else agora
+        with self._lock:
+            e = self._entradas.get(montar_url_diario(data, url_base=url_base))
+        if not e:
+            return None
+        expira = e.get("expira_em")
+        if expira is not None and agora >= expira:
+            return None
+        return bool(e.get("existe"))
+
+    def registrar(
+        self,
+        data: DataIn,
+        existe: bool,
+        *,
+        url_base: str = URL_BASE,
+        agora: Optional[float] = None,
+    ) -> None:
+        agora = time.time() if agora is None else agora
+        d = _to_date(data)
+        expira = None
+        if not existe:
+            hoje = datetime.fromtimestamp(agora, TZ_BR).date()
+            if (hoje - d).days < DIAS_RECENTES:
+                expira = agora + TTL_AUSENTE_RECENTE
+        with self._lock:
+            self._entradas[montar_url_diario(d, url_base=url_base)] = {
+                "existe": bool(existe),
+                "verificado_em": agora,
+                "expira_em": expira,
+            }
+
+
+def _intervalo(start: DataIn, end: DataIn) -> Iterator[date]:
+    d, fim = _to_date(start), _to_date(end)
+    while d <= fim:
+        yield d
+        d += timedelta(days=1)
+
+
+def available_dates(
+    start: DataIn,
+    end: DataIn,
+    *,
+    cache: Optional[CacheDisponibilidade] = None,
+    url_base: str = URL_BASE,
+    max_workers: int = 8,
+    timeout: float = 10.0,
+) -> list[str]:
+    """
+    Datas (YYYY-MM-DD, inclusivo) em [start, end] que têm DL publicado.
+
+    - Consulta o cache persistente primeiro
+    - Sonda as datas restantes em paralelo (sem baixar o PDF inteiro)
+    - Grava no cache apenas resultados conclusivos
+
+    Sem `cache=`, usa o arquivo em CACHE_PATH só para o servidor oficial; para
+    outro `url_base` o cache fica apenas em memória.
+    """
+    if cache is None:
+        cache = CacheDisponibilidade(CACHE_PATH if url_base == URL_BASE else None)
+    datas = list(_intervalo(start, end))
+
+    conhecidas: Dict[date, bool] = {}
+    pendentes: list[date] = []
+    for d in datas:
+        r = cache.consultar(d, url_base=url_base)
+        if r is None:
+            pendentes.append(d)
+        else:
+            conhecidas[d] = r
+
+    if pendentes:
+        urls = [montar_url_diario(d, url_base=url_base) for d in pendentes]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as ex:
+            resultados = list(ex.map(lambda u: sondar_url(u, timeout=timeout), urls))
+
+        for d, r in zip(pendentes, resultados):
+            if r is None:
+                continue
+            cache.registrar(d, r, url_base=url_base)
+            conhecidas[d] = r
+        cache.salvar()
+
+    return [d.isoformat() for d in datas if conhecidas.get(d)]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.disponibilidade import (
+    DIAS_RECENTES,
+    TTL_AUSENTE_RECENTE,
+    TZ_BR,
+    CacheDisponibilidade,
+    available_dates,
+)
+
+# L<YYYYMMDD>.pdf -> (status, corpo[, Content-Length declarado]); o resto responde 404
+RESPOSTAS = {
+    "L20240102.pdf": (206, b"%PDF-"),
+    "L20240103.pdf": (200, b"<html>"),
+    "L20240104.pdf": (503, b""),
+    "L20240106.pdf": (200, b"%PD", 100),   # truncado: Content-Length declara mais
+    "L20240107.pdf": (200, b""),           # soft-404 vazio, completo
+    "L20240108.pdf": (200, b"ok"),         # corpo curto, completo
+}
+PDF_GRANDE = "L20240110.pdf"   # ignora Range e segura o resto do corpo
+BARREIRA = "/2024/L202402"     # datas de fevereiro esperam umas pelas outras
+N_BARREIRA = 4
+
+
+@pytest.fixture
+def servidor():
+    hits: list[str] = []
+    ranges: list[str] = []
+    libera = threading.Event()
+    barreira = threading.Barrier(N_BARREIRA)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            ranges.append(self.headers["Range"])
+            nome = self.path.rsplit("/", 1)[-1]
+
+            if nome == PDF_GRANDE:
+                resto = b"0" * (8 << 20)
+                self.send_response(200)
+                self.send_header("Content-Length", str(5 + len(resto)))
+                self.end_headers()
+                self.wfile.write(b"%PDF-")
+                self.wfile.flush()
+                libera.wait(10)
+                try:
+                    self.wfile.write(resto)
+                except OSError:
+                    pass
+                return
+
+            if self.path.startswith(BARREIRA):
+                try:
+                    barreira.wait(timeout=5)
+                    status, corpo = 206, b"%PDF-"
+                except threading.BrokenBarrierError:
+                    status, corpo = 503, b""
+                tamanho = len(corpo)
+            else:
+                status, corpo, *decl = RESPOSTAS.get(nome, (404, b""))
+                tamanho = decl[0] if decl else len(corpo)
+
+            self.send_response(status)
+            self.send_header("Content-Length", str(tamanho))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    srv.daemon_threads = True
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{srv.server_port}", hits, ranges
+    libera.set()
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_presente_404_e_nao_pdf(servidor, tmp_path):
+    url_base, _, _ = servidor
+    cache = CacheDisponibilidade(tmp_path / "cache.json")
+
+    datas = available_dates("2024-01-01", "2024-01-05", cache=cache, url_base=url_base)
+
+    assert datas == ["2024-01-02"]
+    assert cache.consultar("2024-01-01", url_base=url_base) is False   # 404
+    assert cache.consultar("2024-01-02", url_base=url_base) is True
+    assert cache.consultar("2024-01-03", url_base=url_base) is False   # não-PDF
+
+
+def test_inconclusivo_nao_e_cacheado(servidor, tmp_path):
+    url_base, hits, _ = servidor
+    path = tmp_path / "cache.json"
+
+    available_dates("2024-01-04", "2024-01-04", cache=CacheDisponibilidade(path), url_base=url_base)
+    assert CacheDisponibilidade(path).consultar("2024-01-04", url_base=url_base) is None
+
+    available_dates("2024-01-04", "2024-01-04", cache=CacheDisponibilidade(path), url_base=url_base)
+    assert len(hits) == 2
+
+
+def test_corpo_truncado_e_inconclusivo(servidor, tmp_path):
+    url_base, _, _ = servidor
+    cache = CacheDisponibilidade(tmp_path / "cache.json")
+
+    assert available_dates("2024-01-06", "2024-01-08", cache=cache, url_base=url_base) == []
+    assert cache.consultar("2024-01-06", url_base=url_base) is None    # truncado
+    assert cache.consultar("2024-01-07", url_base=url_base) is False   # vazio, completo
+    assert cache.consultar("2024-01-08", url_base=url_base) is False   # curto, completo
+
+
+def test_sonda_so_a_assinatura(servidor, tmp_path):
+    url_base, _, ranges = servidor
+    cache = CacheDisponibilidade(tmp_path / "cache.json")
+
+    t0 = time.monotonic()
+    # o servidor só manda o resto do PDF no teardown: ler além da assinatura estouraria o timeout
+    datas = available_dates("2024-01-10", "2024-01-10", cache=cache, url_base=url_base, timeout=2)
+
+    assert datas == ["2024-01-10"]
+    assert time.monotonic() - t0 < 2
+    assert ranges == ["bytes=0-4"]
+
+
+def test_sondas_concorrentes(servidor, tmp_path):
+    url_base, hits, _ = servidor
+    cache = CacheDisponibilidade(tmp_path / "cache.json")
+
+    # cada requisição só responde quando N_BARREIRA estiverem em andamento ao mesmo tempo
+    datas = available_dates(
+        "2024-02-01", f"2024-02-{N_BARREIRA:02d}",
+        cache=cache, url_base=url_base, max_workers=N_BARREIRA,
+    )
+
+    assert datas == [f"2024-02-{i:02d}" for i in range(1, N_BARREIRA + 1)]
+    assert len(hits) == N_BARREIRA
+
+
+def test_segunda_chamada_usa_cache(servidor, tmp_path):
+    url_base, hits, _ = servidor
+    path = tmp_path / "cache.json"
+
+    primeira = available_dates("2024-01-01", "2024-01-05", cache=CacheDisponibilidade(path), url_base=url_base)
+    n = len(hits)
+    segunda = available_dates("2024-01-01", "2024-01-05", cache=CacheDisponibilidade(path), url_base=url_base)
+
+    assert primeira == segunda == ["2024-01-02"]
+    # só a data com 503 é sondada de novo
+    assert hits[n:] == ["/2024/L20240104.pdf"]
+
+
+def test_cache_separado_por_url_base(tmp_path):
+    cache = CacheDisponibilidade(tmp_path / "cache.json")
+    cache.registrar("2024-01-02", True, url_base="http://127.0.0.1:1")
+
+    assert cache.consultar("2024-01-02") is None
+    assert cache.consultar("2024-01-02", url_base="http://127.0.0.1:1") is True
+
+
+def test_expiracao_de_ausencias(tmp_path):
+    agora_dt = datetime(2024, 3, 20, 12, tzinfo=TZ_BR)
+    agora = agora_dt.timestamp()
+    hoje = agora_dt.date()
+    recente = hoje - timedelta(days=1)
+    antiga = hoje - timedelta(days=DIAS_RECENTES + 1)
+    cache = CacheDisponibilidade(tmp_path / "cache.json")
+
+    cache.registrar(recente, False, agora=agora)
+    cache.registrar(antiga, False, agora=agora)
+    cache.registrar(antiga + timedelta(days=1), True, agora=agora)   # presente
+
+    depois = agora + TTL_AUSENTE_RECENTE + 1
+    assert cache.consultar(recente, agora=agora) is False
+    assert cache.consultar(recente, agora=depois) is None
+    assert cache.consultar(antiga, agora=depois + 365 * 86400) is False
+    assert cache.consultar(antiga + timedelta(days=1), agora=depois + 365 * 86400) is True
+
+
+def test_salvar_mescla_com_disco(tmp_path):
+    path = tmp_path / "cache.json"
+    a = CacheDisponibilidade(path)
+    b = CacheDisponibilidade(path)
+
+    a.registrar("2024-01-02", True)
+    a.salvar()
+    b.registrar("2024-01-03", False)
+    b.salvar()
+
+    final = CacheDisponibilidade(path)
+    assert final.consultar("2024-01-02") is True
+    assert final.consultar("2024-01-03") is False
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_cache_corrompido_e_ignorado(tmp_path):
+    path = tmp_path / "cache.json"
+    url = "https://diariolegislativo.almg.gov.br/2024/L20240102.pdf"
+    path.write_text(
+        '{"x": true, "%s": {"existe": false, "expira_em": "amanha"},'
+        ' "%s": {"existe": true, "expira_em": null}}'
+        % (url.replace("0102", "0103"), url),
+        encoding="utf-8",
+    )
+
+    cache = CacheDisponibilidade(path)
+    assert cache.consultar("2024-01-03") is None
+    assert cache.consultar("2024-01-02") is True
+
+    cache.registrar("2024-01-04", False)
+    cache.salvar()
+    assert CacheDisponibilidade(path).consultar("2024-01-04") is False
+
+
+def test_data_fora_do_formato():
+    with pytest.raises(ValueError, match="YYYY-MM-DD ou YYYYMMDD"):
+        available_dates("06012026", "06012026", cache=CacheDisponibilidade(None))